@@ -5,23 +5,43 @@ This script uses a pre-trained, multi-model architecture to predict reimbursemen
 """
 
 import sys
-import argparse
+import json
+import functools
 import joblib
 import numpy as np
 
-# Load the trained models
 try:
-    model_per_diem = joblib.load('model_per_diem_trips.joblib')
-    model_receipt_driven = joblib.load('model_receipt-driven_trips.joblib')
-    model_standard = joblib.load('model_standard_trips.joblib')
-except FileNotFoundError as e:
-    print(f"Error: A required model file was not found. Please run analysis.py to train all models. Missing file: {e.filename}", file=sys.stderr)
-    sys.exit(1)
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Trained specialist models, loaded on first use
+MODEL_FILES = {
+    'per_diem': 'model_per_diem_trips.joblib',
+    'receipt_driven': 'model_receipt-driven_trips.joblib',
+    'standard': 'model_standard_trips.joblib',
+}
+
+@functools.lru_cache(maxsize=None)
+def load_model(category):
+    """
+    Loads the specialist model for a trip category once and keeps it cached.
+    A single-trip call only pays for the one model it needs.
+    """
+    try:
+        return joblib.load(MODEL_FILES[category])
+    except FileNotFoundError as e:
+        print(f"Error: A required model file was not found. Please run analysis.py to train all models. Missing file: {e.filename}", file=sys.stderr)
+        sys.exit(1)
+
+# Reused (1, n_features) input row for single-trip predictions
+_FEATURE_ROW = np.empty((1, 14), dtype=np.float64)
 
 def create_features(trip_duration_days, miles_traveled, total_receipts_amount):
     """
     Creates an expanded feature vector from the raw inputs for the model.
-    This must match the feature creation in analysis.py exactly.
+    This must match create_features_batch exactly.
     """
     # Base features
     features = [
@@ -52,30 +72,119 @@ def create_features(trip_duration_days, miles_traveled, total_receipts_amount):
     
     return features
 
+def create_features_batch(days, miles, receipts):
+    """
+    Creates the feature matrix for a batch of trips, one row per trip.
+    analysis.py trains on this same matrix, so training and inference agree.
+    """
+    days = np.asarray(days, dtype=np.float64)
+    miles = np.asarray(miles, dtype=np.float64)
+    receipts = np.asarray(receipts, dtype=np.float64)
+
+    # Derived features (0 wherever the denominator is not positive)
+    no_days = days <= 0
+    no_miles = miles <= 0
+    days_safe = np.where(no_days, 1, days)
+    miles_safe = np.where(no_miles, 1, miles)
+    miles_per_day = miles / days_safe
+    receipts_per_day = receipts / days_safe
+    receipt_per_mile = receipts / miles_safe
+    miles_per_day[no_days] = 0
+    receipts_per_day[no_days] = 0
+    receipt_per_mile[no_miles] = 0
+
+    return np.column_stack([
+        # Base features
+        days,
+        miles,
+        receipts,
+        miles_per_day,
+        receipts_per_day,
+        receipt_per_mile,
+        days * days,
+        miles * miles,
+        receipts * receipts,
+        # Interaction features inspired by interview analysis
+        days * miles_per_day,
+        receipts_per_day * miles,
+        days * receipts,
+        miles * receipts,
+        miles_per_day * receipts_per_day
+    ])
+
+@functools.lru_cache(maxsize=4096)
 def calculate_reimbursement(trip_duration_days, miles_traveled, total_receipts_amount):
     """
     Classifies the trip and uses the appropriate specialist model to predict reimbursement.
+    Results are cached on the exact inputs, so repeated trips skip the model.
     """
     # Create the feature vector
-    features = create_features(trip_duration_days, miles_traveled, total_receipts_amount)
-    features_array = np.array(features).reshape(1, -1)
+    _FEATURE_ROW[0] = create_features(trip_duration_days, miles_traveled, total_receipts_amount)
     
     # Classify the trip to select the correct model
     is_per_diem_trip = (trip_duration_days >= 7 and total_receipts_amount < (trip_duration_days * 50))
     is_receipt_driven_trip = (trip_duration_days <= 3 and total_receipts_amount > (trip_duration_days * 150))
 
     if is_per_diem_trip:
-        model = model_per_diem
+        model = load_model('per_diem')
     elif is_receipt_driven_trip:
-        model = model_receipt_driven
+        model = load_model('receipt_driven')
     else:
-        model = model_standard
+        model = load_model('standard')
         
     # Predict the reimbursement
-    prediction = model.predict(features_array)
+    prediction = model.predict(_FEATURE_ROW)
     
     return round(prediction[0], 2)
 
+def calculate_reimbursement_batch(trip_duration_days, miles_traveled, total_receipts_amount, features=None):
+    """
+    Predicts reimbursements for many trips at once.
+    Trips are split by category and each specialist model is called once on
+    its whole slice, instead of once per trip. Callers that already built the
+    feature matrix with create_features_batch can pass it in to reuse it.
+    """
+    days = np.asarray(trip_duration_days, dtype=np.float64)
+    miles = np.asarray(miles_traveled, dtype=np.float64)
+    receipts = np.asarray(total_receipts_amount, dtype=np.float64)
+
+    if features is None:
+        features = create_features_batch(days, miles, receipts)
+
+    is_per_diem_trip = (days >= 7) & (receipts < days * 50)
+    is_receipt_driven_trip = (days <= 3) & (receipts > days * 150)
+    is_standard_trip = ~(is_per_diem_trip | is_receipt_driven_trip)
+
+    predictions = np.empty(len(days), dtype=np.float64)
+    for mask, category in ((is_per_diem_trip, 'per_diem'),
+                           (is_receipt_driven_trip, 'receipt_driven'),
+                           (is_standard_trip, 'standard')):
+        if mask.any():
+            predictions[mask] = load_model(category).predict(features[mask])
+
+    return np.round(predictions, 2, out=predictions)
+
+def predict_test_cases(test_cases):
+    """
+    Batch-predicts a list of public-case dicts.
+    Returns the calculated and expected reimbursements as two lists.
+    """
+    inputs = [case['input'] for case in test_cases]
+    calculated = calculate_reimbursement_batch(
+        [case_inputs['trip_duration_days'] for case_inputs in inputs],
+        [case_inputs['miles_traveled'] for case_inputs in inputs],
+        [case_inputs['total_receipts_amount'] for case_inputs in inputs]
+    ).tolist()
+    expected = [case['expected_output'] for case in test_cases]
+    return calculated, expected
+
+def load_public_test_cases(filename='public_cases.json'):
+    """
+    Load the historical input/output cases used by the analysis scripts.
+    """
+    with open(filename, 'rb') as f:
+        return _json_loads(f.read())
+
 def validate_inputs(trip_duration_days, miles_traveled, total_receipts_amount):
     """
     Validate input parameters to ensure they are valid for reimbursement calculation.
@@ -91,8 +200,19 @@ def validate_inputs(trip_duration_days, miles_traveled, total_receipts_amount):
     
     return True, ""
 
-def main():
-    """Main function to handle command-line arguments and execute calculation."""
+def parse_arguments(argv):
+    """
+    Parses the three positional inputs into floats.
+    Three plain numbers are converted directly; argparse is only built for
+    --help and malformed invocations, where it prints usage and exits.
+    """
+    if len(argv) == 3:
+        try:
+            return tuple(float(arg) for arg in argv)
+        except ValueError:
+            pass
+    
+    import argparse
     parser = argparse.ArgumentParser(
         description='Calculate reimbursement amount for business trips',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -100,6 +220,7 @@ def main():
 Examples:
   python3 calculate_reimbursement.py 3 150 275.50
   python3 calculate_reimbursement.py 1 0 45.25
+  python3 calculate_reimbursement.py --stdin-batch < trips.txt
         """
     )
     
@@ -110,14 +231,54 @@ Examples:
     parser.add_argument('total_receipts_amount', type=float,
                         help='Total amount from receipts')
     
+    args = parser.parse_args(argv)
+    return args.trip_duration_days, args.miles_traveled, args.total_receipts_amount
+
+def run_stdin_batch():
+    """
+    Reads one "days miles receipts" trip per line from stdin and writes one
+    reimbursement per line, predicting all trips in a single batch so the
+    models are loaded once for the whole run.
+    """
+    trips = []
+    for line_number, line in enumerate(sys.stdin, 1):
+        if not line.strip():
+            continue
+        values = line.split()
+        if len(values) != 3:
+            print(f"Error: line {line_number}: expected 3 values, got {len(values)}", file=sys.stderr)
+            sys.exit(1)
+        try:
+            trip = tuple(float(value) for value in values)
+        except ValueError as e:
+            print(f"Error: line {line_number}: {e}", file=sys.stderr)
+            sys.exit(1)
+        is_valid, error_message = validate_inputs(*trip)
+        if not is_valid:
+            print(f"Error: line {line_number}: {error_message}", file=sys.stderr)
+            sys.exit(1)
+        trips.append(trip)
+    
+    if not trips:
+        return
+    
+    reimbursements = calculate_reimbursement_batch(*zip(*trips))
+    sys.stdout.write("\n".join(f"{reimbursement:.2f}" for reimbursement in reimbursements) + "\n")
+
+def main():
+    """Main function to handle command-line arguments and execute calculation."""
     try:
-        args = parser.parse_args()
+        if sys.argv[1:] == ['--stdin-batch']:
+            run_stdin_batch()
+            return
+        
+        trip_duration_days, miles_traveled, total_receipts_amount = parse_arguments(sys.argv[1:])
         
         # Validate inputs
         is_valid, error_message = validate_inputs(
-            args.trip_duration_days, 
-            args.miles_traveled, 
-            args.total_receipts_amount
+            trip_duration_days, 
+            miles_traveled, 
+            total_receipts_amount
         )
         
         if not is_valid:
@@ -126,13 +287,13 @@ Examples:
         
         # Calculate reimbursement
         reimbursement = calculate_reimbursement(
-            args.trip_duration_days,
-            args.miles_traveled, 
-            args.total_receipts_amount
+            trip_duration_days,
+            miles_traveled, 
+            total_receipts_amount
         )
         
         # Output the result (single number as required)
-        print(f"{reimbursement:.2f}")
+        sys.stdout.write(f"{reimbursement:.2f}\n")
         
     except Exception as e:
         print(f"Error: {str(e)}", file=sys.stderr)
@@ -6,7 +6,26 @@ Analyzes the worst-performing test cases to identify specific patterns for targe
 
 import json
 import sys
-from calculate_reimbursement import calculate_reimbursement, load_public_test_cases
+import numpy as np
+from calculate_reimbursement import calculate_reimbursement_batch, create_features_batch, load_public_test_cases
+
+# Fields of the per-case error table
+CASE_DTYPE = np.dtype([
+    ('case_id', np.int64),
+    ('days', np.int64),
+    ('miles', np.float64),
+    ('receipts', np.float64),
+    ('miles_per_day', np.float64),
+    ('receipts_per_day', np.float64),
+    ('expected', np.float64),
+    ('calculated', np.float64),
+    ('absolute_error', np.float64),
+    ('percentage_error', np.float64),
+    ('direction', 'U13')
+])
+
+# Fields that hold raw JSON amounts, which may be whole numbers
+AMOUNT_FIELDS = ('miles', 'receipts', 'expected')
 
 def load_and_analyze_worst_cases(num_worst=50):
     """
@@ -16,65 +35,76 @@ def load_and_analyze_worst_cases(num_worst=50):
         num_worst (int): Number of worst cases to analyze in detail
         
     Returns:
-        dict: Analysis results including worst cases and patterns
+        dict: Analysis results. all_cases is a CASE_DTYPE structured array
+        sorted by absolute error, worst first; use case_records for dicts.
     """
     print(f"Loading test cases and analyzing worst {num_worst} cases...")
     
     # Load test cases
     test_cases = load_public_test_cases()
     
-    # Calculate errors for all cases
-    error_analysis = []
-    
-    for i, case in enumerate(test_cases):
-        if i % 100 == 0:
-            print(f"Processing case {i+1}/{len(test_cases)}...")
-            
-        input_data = case['input']
-        expected = case['expected_output']
-        
-        # Extract inputs
-        days = input_data['trip_duration_days']
-        miles = input_data['miles_traveled']
-        receipts = input_data['total_receipts_amount']
-        
-        # Calculate our reimbursement
-        calculated = calculate_reimbursement(days, miles, receipts)
-        
-        # Calculate errors
-        absolute_error = abs(calculated - expected)
-        percentage_error = (absolute_error / expected * 100) if expected > 0 else 0
-        
-        # Determine error direction
-        direction = "overestimate" if calculated > expected else "underestimate"
-        
-        # Calculate derived metrics
-        miles_per_day = miles / days if days > 0 else 0
-        receipts_per_day = receipts / days if days > 0 else 0
-        
-        error_analysis.append({
-            'case_id': i,
-            'days': days,
-            'miles': miles,
-            'receipts': receipts,
-            'miles_per_day': miles_per_day,
-            'receipts_per_day': receipts_per_day,
-            'expected': expected,
-            'calculated': calculated,
-            'absolute_error': absolute_error,
-            'percentage_error': percentage_error,
-            'direction': direction
-        })
-    
-    # Sort by absolute error to find worst cases
-    error_analysis.sort(key=lambda x: x['absolute_error'], reverse=True)
+    # Build the feature matrix once; it already holds the per-day ratios
+    inputs = [case['input'] for case in test_cases]
+    days_values = [input_data['trip_duration_days'] for input_data in inputs]
+    miles_values = [input_data['miles_traveled'] for input_data in inputs]
+    receipts_values = [input_data['total_receipts_amount'] for input_data in inputs]
+    expected_values = [case['expected_output'] for case in test_cases]
+    features = create_features_batch(days_values, miles_values, receipts_values)
+    
+    # Predict every case in one batch; each specialist model runs once
+    print(f"Predicting {len(test_cases)} cases in one batch...")
+    calculated = calculate_reimbursement_batch(
+        days_values, miles_values, receipts_values, features=features
+    )
+    
+    # Calculate errors for all cases as whole columns
+    expected = np.asarray(expected_values, dtype=np.float64)
+    absolute_errors = np.abs(calculated - expected)
+    has_expected = expected > 0
+    percentage_errors = absolute_errors / np.where(has_expected, expected, 1) * 100
+    percentage_errors[~has_expected] = 0
+    
+    # One structured array holds every case as numeric columns
+    all_cases = np.empty(len(test_cases), dtype=CASE_DTYPE)
+    all_cases['case_id'] = np.arange(len(test_cases))
+    all_cases['days'] = days_values
+    all_cases['miles'] = miles_values
+    all_cases['receipts'] = receipts_values
+    all_cases['miles_per_day'] = features[:, 3]
+    all_cases['receipts_per_day'] = features[:, 4]
+    all_cases['expected'] = expected_values
+    all_cases['calculated'] = calculated
+    all_cases['absolute_error'] = absolute_errors
+    all_cases['percentage_error'] = percentage_errors
+    all_cases['direction'] = np.where(calculated > expected, "overestimate", "underestimate")
+    
+    # Sort by absolute error to find worst cases (stable, so ties keep case order)
+    all_cases = all_cases[np.argsort(-absolute_errors, kind='stable')]
     
     return {
-        'all_cases': error_analysis,
-        'worst_cases': error_analysis[:num_worst],
-        'total_cases': len(error_analysis)
+        'all_cases': all_cases,
+        'worst_cases': case_records(all_cases[:num_worst]),
+        'total_cases': len(test_cases)
     }
 
+def case_records(cases):
+    """
+    Convert rows of the structured case array into plain case dicts.
+    Whole-number amounts come back as ints, as they appear in the cases file.
+    
+    Args:
+        cases (np.ndarray): Rows with the CASE_DTYPE fields
+        
+    Returns:
+        list: One dict per case, keyed by field name
+    """
+    records = [dict(zip(CASE_DTYPE.names, row)) for row in cases.tolist()]
+    for record in records:
+        for field in AMOUNT_FIELDS:
+            if record[field].is_integer():
+                record[field] = int(record[field])
+    return records
+
 def analyze_error_patterns(worst_cases):
     """
     Analyze patterns in the worst-performing cases.
@@ -347,8 +377,10 @@ def save_analysis_to_file(analysis_results, filename="task_10_6_error_analysis.j
         filename (str): Output filename
     """
     try:
+        # Persist the case table as a list of case dicts, like the other case lists
+        serializable = dict(analysis_results, all_cases=case_records(analysis_results['all_cases']))
         with open(filename, 'w') as f:
-            json.dump(analysis_results, f, indent=2)
+            json.dump(serializable, f, indent=2)
         print(f"\n💾 Detailed analysis saved to {filename}")
     except Exception as e:
         print(f"⚠️  Could not save analysis to file: {e}")
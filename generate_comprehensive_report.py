@@ -7,9 +7,15 @@ error analysis frameworks and provides actionable insights for improving
 the reimbursement calculation model.
 """
 
+import json
 from calculate_reimbursement import *
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def main():
     """Generate the comprehensive error analysis report."""
     print("🔍 COMPREHENSIVE ERROR ANALYSIS REPORT GENERATOR")
@@ -78,11 +84,8 @@ def main():
         # Save structured report as JSON for programmatic access
         json_filename = f"error_analysis_data_{timestamp}.json"
         try:
-            import json
-            with open(json_filename, 'w') as f:
-                # Convert to JSON-serializable format
-                json_data = convert_to_json_serializable(structured_report)
-                json.dump(json_data, f, indent=2)
+            with open(json_filename, 'wb') as f:
+                f.write(dumps_json(structured_report))
             print(f"📊 STRUCTURED DATA SAVED TO: {json_filename}")
         except Exception as e:
             print(f"⚠️  Could not save JSON data: {e}")
@@ -105,16 +108,22 @@ def main():
         traceback.print_exc()
         return None
 
-def convert_to_json_serializable(obj):
-    """Convert complex objects to JSON-serializable format."""
-    if isinstance(obj, dict):
-        return {key: convert_to_json_serializable(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_to_json_serializable(item) for item in obj]
-    elif hasattr(obj, '__dict__'):
-        return convert_to_json_serializable(obj.__dict__)
-    else:
-        return obj
+def json_default(obj):
+    """Serialize objects with attributes by their __dict__."""
+    if hasattr(obj, '__dict__'):
+        return obj.__dict__
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps_json(obj):
+    """
+    Encode the structured report as indented UTF-8 JSON bytes, using orjson when available.
+    Non-ASCII text is written as raw UTF-8 rather than \\uXXXX escapes. orjson
+    writes NaN and infinities as null; the json fallback writes NaN/Infinity.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=json_default,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, indent=2, default=json_default, ensure_ascii=False).encode('utf-8')
 
 if __name__ == "__main__":
     # Run the comprehensive report generation
@@ -1,15 +1,21 @@
 #!/usr/bin/env python3
 
-import json
 import random
+import numpy as np
+from calculate_reimbursement import load_public_test_cases
 
 # Load test cases
-with open('public_cases.json', 'r') as f:
-    data = json.load(f)
+data = load_public_test_cases('public_cases.json')
+
+# Input columns, extracted once so every range filter is a vectorized mask
+durations = np.array([case['input']['trip_duration_days'] for case in data], dtype=np.float64)
+miles_traveled = np.array([case['input']['miles_traveled'] for case in data], dtype=np.float64)
+receipt_totals = np.array([case['input']['total_receipts_amount'] for case in data], dtype=np.float64)
+miles_per_day_values = miles_traveled / durations
 
 # Select diverse sample
 random.seed(42)  # For reproducibility
-sample_cases = []
+sample_indices = []
 
 # Get diverse cases covering different ranges
 ranges = [
@@ -22,18 +28,21 @@ ranges = [
 ]
 
 for r in ranges:
-    matching = [case for case in data if 
-                r['duration'][0] <= case['input']['trip_duration_days'] <= r['duration'][1] and
-                r['miles'][0] <= case['input']['miles_traveled'] <= r['miles'][1] and
-                r['receipts'][0] <= case['input']['total_receipts_amount'] <= r['receipts'][1]]
+    in_range = ((durations >= r['duration'][0]) & (durations <= r['duration'][1]) &
+                (miles_traveled >= r['miles'][0]) & (miles_traveled <= r['miles'][1]) &
+                (receipt_totals >= r['receipts'][0]) & (receipt_totals <= r['receipts'][1]))
+    matching = np.flatnonzero(in_range).tolist()
     if matching:
-        sample_cases.extend(random.sample(matching, min(2, len(matching))))
+        sample_indices.extend(random.sample(matching, min(2, len(matching))))
 
 # Add some random cases to reach 15
-remaining_needed = 15 - len(sample_cases)
+remaining_needed = 15 - len(sample_indices)
 if remaining_needed > 0:
-    remaining_pool = [case for case in data if case not in sample_cases]
-    sample_cases.extend(random.sample(remaining_pool, remaining_needed))
+    chosen = set(sample_indices)
+    remaining_pool = [i for i in range(len(data)) if i not in chosen]
+    sample_indices.extend(random.sample(remaining_pool, remaining_needed))
+
+sample_cases = [data[i] for i in sample_indices]
 
 # Print results
 print('Selected 15 test cases for hypothesis development:')
@@ -41,25 +50,23 @@ print()
 print('| Case | Duration | Miles | Receipts | Expected | Miles/Day | Notes |')
 print('|------|----------|-------|----------|----------|-----------|-------|')
 
-for i, case in enumerate(sample_cases[:15]):
+# Label every shown case at once; the first matching note wins
+shown_durations = durations[sample_indices[:15]]
+shown_miles_per_day = miles_per_day_values[sample_indices[:15]]
+shown_notes = np.select([
+    shown_durations == 1,
+    (shown_durations == 5) & (shown_miles_per_day >= 180) & (shown_miles_per_day <= 220),
+    shown_durations == 5,
+    shown_miles_per_day < 50,
+    shown_miles_per_day > 300
+], ["1-day test", "Employee sweet spot test", "5-day test", "Low efficiency", "High efficiency"], default="")
+
+for i, (case, miles_per_day, notes) in enumerate(zip(sample_cases[:15], shown_miles_per_day, shown_notes.tolist())):
     inputs = case['input']
     expected = case['expected_output']
     duration = inputs['trip_duration_days']
     miles = inputs['miles_traveled']
     receipts = inputs['total_receipts_amount']
-    miles_per_day = miles / duration
-    
-    notes = ""
-    if duration == 1:
-        notes = "1-day test"
-    elif duration == 5 and 180 <= miles_per_day <= 220:
-        notes = "Employee sweet spot test"
-    elif duration == 5:
-        notes = "5-day test"
-    elif miles_per_day < 50:
-        notes = "Low efficiency"
-    elif miles_per_day > 300:
-        notes = "High efficiency"
     
     print(f'| {chr(65+i)} | {duration} | {miles:.0f} | ${receipts:.2f} | ${expected:.2f} | {miles_per_day:.1f} | {notes} |')
 
@@ -3,6 +3,7 @@
 Test script for comprehensive correlation analysis on real data
 """
 
+import heapq
 from calculate_reimbursement import *
 
 def analyze_input_feature_correlations():
@@ -14,19 +15,8 @@ def analyze_input_feature_correlations():
     print("Analyzing first 100 cases...")
     sample_cases = test_cases[:100]
     
-    # Calculate our predictions and get error metrics
-    calculated = []
-    expected = []
-    
-    for case in sample_cases:
-        inputs = case['input']
-        calc_value = calculate_reimbursement(
-            inputs['trip_duration_days'],
-            inputs['miles_traveled'],
-            inputs['total_receipts_amount']
-        )
-        calculated.append(calc_value)
-        expected.append(case['expected_output'])
+    # Calculate our predictions in one batch and get error metrics
+    calculated, expected = predict_test_cases(sample_cases)
     
     # Get error metrics
     error_metrics = calculate_error_metrics(calculated, expected)
@@ -77,14 +67,10 @@ def analyze_input_feature_correlations():
             interaction_data = interactions[interaction_key]
             print(f"\n  {friendly_name}:")
             
-            # Sort regions by error severity
-            sorted_regions = sorted(
-                [(region, stats) for region, stats in interaction_data.items()],
-                key=lambda x: x[1]['mean_error'],
-                reverse=True
-            )
+            # Top 3 worst regions by error severity
+            worst_regions = heapq.nlargest(3, interaction_data.items(), key=lambda x: x[1]['mean_error'])
             
-            for region, stats in sorted_regions[:3]:  # Top 3 worst regions
+            for region, stats in worst_regions:
                 if stats['count'] >= 2:
                     print(f"    {region.replace('_', ' ').title()}: {stats['count']} cases")
                     print(f"      Mean Error: {stats['mean_error']:.1f}%")
@@ -95,9 +81,9 @@ def analyze_input_feature_correlations():
     print(f"\n📋 TRIP TYPE ERROR PATTERNS:")
     
     trip_type_patterns = [(k, v) for k, v in interactions.items() if k.startswith('trip_type_')]
-    trip_type_patterns.sort(key=lambda x: x[1]['mean_error'], reverse=True)
+    worst_trip_types = heapq.nlargest(10, trip_type_patterns, key=lambda x: x[1]['mean_error'])
     
-    for trip_type_key, stats in trip_type_patterns[:10]:  # Top 10 worst trip types
+    for trip_type_key, stats in worst_trip_types:  # Top 10 worst trip types
         trip_type = trip_type_key.replace('trip_type_', '').replace('_', ' + ').title()
         print(f"  {trip_type}: {stats['count']} cases")
         print(f"    Mean Error: {stats['mean_error']:.1f}%")
@@ -195,10 +181,10 @@ def analyze_input_feature_correlations():
                     threshold_value = threshold_key.replace('threshold_', '')
                     significant_thresholds.append((threshold_value, effect, threshold_data))
         
-        # Sort by significance
-        significant_thresholds.sort(key=lambda x: abs(x[1]['error_change']), reverse=True)
+        # Top 3 significant thresholds
+        top_thresholds = heapq.nlargest(3, significant_thresholds, key=lambda x: abs(x[1]['error_change']))
         
-        for threshold_value, effect, data in significant_thresholds[:3]:  # Top 3 significant thresholds
+        for threshold_value, effect, data in top_thresholds:
             print(f"    Threshold {threshold_value}:")
             print(f"      Below: {data['below_threshold']['count']} cases, {data['below_threshold']['mean_error']:.1f}% error")
             print(f"      Above: {data['above_threshold']['count']} cases, {data['above_threshold']['mean_error']:.1f}% error")
@@ -245,8 +231,7 @@ def analyze_input_feature_correlations():
     
     if high_risk_interactions:
         print(f"  • High-Risk Trip Type Combinations:")
-        high_risk_interactions.sort(key=lambda x: x[1], reverse=True)
-        for trip_type, negative_rate in high_risk_interactions[:3]:
+        for trip_type, negative_rate in heapq.nlargest(3, high_risk_interactions, key=lambda x: x[1]):
             print(f"    - {trip_type.title()}: {negative_rate:.1f}% negative rate")
     
     print("\n" + "="*80)
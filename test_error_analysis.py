@@ -3,6 +3,7 @@
 Test script for the error analysis framework
 """
 
+import heapq
 from calculate_reimbursement import *
 
 def test_current_model_performance():
@@ -14,19 +15,8 @@ def test_current_model_performance():
     print("Testing on first 100 cases...")
     sample_cases = test_cases[:100]
     
-    # Calculate our predictions
-    calculated = []
-    expected = []
-    
-    for case in sample_cases:
-        inputs = case['input']
-        calc_value = calculate_reimbursement(
-            inputs['trip_duration_days'],
-            inputs['miles_traveled'],
-            inputs['total_receipts_amount']
-        )
-        calculated.append(calc_value)
-        expected.append(case['expected_output'])
+    # Calculate our predictions in one batch
+    calculated, expected = predict_test_cases(sample_cases)
     
     # Analyze errors
     print("Analyzing errors...")
@@ -58,10 +48,9 @@ def test_current_model_performance():
     # Show some examples of worst errors
     print(f"\n🔍 Worst Error Examples:")
     error_data = result['error_data']
-    sorted_errors = sorted(error_data, key=lambda x: x['absolute_percentage_error'], reverse=True)
+    worst_errors = heapq.nlargest(5, error_data, key=lambda x: x['absolute_percentage_error'])
     
-    for i in range(min(5, len(sorted_errors))):
-        err = sorted_errors[i]
+    for err in worst_errors:
         idx = err['test_case_index']
         case = sample_cases[idx]
         inputs = case['input']
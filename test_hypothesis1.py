@@ -1,15 +1,17 @@
 #!/usr/bin/env python3
 
+import numpy as np
+
 def calculate_reimbursement_hypothesis1(duration, miles, receipts):
-    base_rate = max(900 - (duration - 1) * 200, 100)
+    base_rate = np.maximum(900 - (duration - 1) * 200, 100)
     receipt_component = receipts * 0.75
     miles_per_day = miles / duration
-    efficiency_penalty = -max(0, (miles_per_day - 50) * 0.5)
+    efficiency_penalty = -np.maximum(0, (miles_per_day - 50) * 0.5)
     
     return base_rate + receipt_component + efficiency_penalty
 
-# Test cases from our sample
-test_cases = [
+# Test cases from our sample, one record per case
+test_cases = np.rec.array([
     (1, 47, 17.97, 128.91, 'A'),
     (1, 55, 3.60, 126.06, 'B'),
     (2, 68, 756.61, 648.53, 'C'),
@@ -25,26 +27,28 @@ test_cases = [
     (2, 623, 347.54, 625.15, 'M'),
     (2, 941, 1565.77, 1432.79, 'N'),
     (9, 963, 588.50, 1434.42, 'O'),
-]
+], dtype=[('duration', 'i8'), ('miles', 'f8'), ('receipts', 'f8'), ('expected', 'f8'), ('letter', 'U1')])
+
+# Column arrays so each hypothesis is evaluated over all cases in one call
+durations = test_cases.duration.astype(np.float64)
+miles_values, receipts_values, expected_values = test_cases.miles, test_cases.receipts, test_cases.expected
 
 print("Hypothesis 1 Test Results:")
 print("| Case | Duration | Miles | Receipts | Expected | Predicted | Error | Error % |")
 print("|------|----------|-------|----------|----------|-----------|-------|---------|")
 
-total_error = 0
-accurate_count = 0
+predicted_values = calculate_reimbursement_hypothesis1(durations, miles_values, receipts_values)
+errors = predicted_values - expected_values
+error_pcts = (errors / expected_values) * 100
 
-for duration, miles, receipts, expected, case_letter in test_cases:
-    predicted = calculate_reimbursement_hypothesis1(duration, miles, receipts)
-    error = predicted - expected
-    error_pct = (error / expected) * 100
-    
-    if abs(error_pct) <= 25:
-        accurate_count += 1
-    
-    total_error += abs(error_pct)
-    
-    print(f"| {case_letter} | {duration} | {miles:.0f} | ${receipts:.2f} | ${expected:.2f} | ${predicted:.2f} | {error:+.2f} | {error_pct:+.1f}% |")
+accurate_count = int(np.count_nonzero(np.abs(error_pcts) <= 25))
+total_error = float(np.abs(error_pcts).sum())
+
+print("\n".join(
+    f"| {case_letter} | {duration} | {miles:.0f} | ${receipts:.2f} | ${expected:.2f} | ${predicted:.2f} | {error:+.2f} | {error_pct:+.1f}% |"
+    for (duration, miles, receipts, expected, case_letter), predicted, error, error_pct
+    in zip(test_cases, predicted_values, errors, error_pcts)
+))
 
 print(f"\nSummary:")
 print(f"Accurate predictions (±25% error): {accurate_count}/15 ({accurate_count/15*100:.1f}%)")
@@ -55,30 +59,28 @@ print("\n" + "="*80)
 print("REFINED VERSION - Lower base rates, higher receipt multiplier:")
 
 def calculate_reimbursement_hypothesis1_refined(duration, miles, receipts):
-    base_rate = max(100 - (duration - 1) * 10, 50)  # Much lower base
+    base_rate = np.maximum(100 - (duration - 1) * 10, 50)  # Much lower base
     receipt_component = receipts * 1.0  # Higher receipt multiplier
     miles_per_day = miles / duration
-    efficiency_penalty = -max(0, (miles_per_day - 30) * 2.0)  # Stronger penalty
+    efficiency_penalty = -np.maximum(0, (miles_per_day - 30) * 2.0)  # Stronger penalty
     
     return base_rate + receipt_component + efficiency_penalty
 
 print("| Case | Duration | Miles | Receipts | Expected | Predicted | Error | Error % |")
 print("|------|----------|-------|----------|----------|-----------|-------|---------|")
 
-total_error_refined = 0
-accurate_count_refined = 0
+predicted_values = calculate_reimbursement_hypothesis1_refined(durations, miles_values, receipts_values)
+errors = predicted_values - expected_values
+error_pcts = (errors / expected_values) * 100
 
-for duration, miles, receipts, expected, case_letter in test_cases:
-    predicted = calculate_reimbursement_hypothesis1_refined(duration, miles, receipts)
-    error = predicted - expected
-    error_pct = (error / expected) * 100
-    
-    if abs(error_pct) <= 25:
-        accurate_count_refined += 1
-    
-    total_error_refined += abs(error_pct)
-    
-    print(f"| {case_letter} | {duration} | {miles:.0f} | ${receipts:.2f} | ${expected:.2f} | ${predicted:.2f} | {error:+.2f} | {error_pct:+.1f}% |")
+accurate_count_refined = int(np.count_nonzero(np.abs(error_pcts) <= 25))
+total_error_refined = float(np.abs(error_pcts).sum())
+
+print("\n".join(
+    f"| {case_letter} | {duration} | {miles:.0f} | ${receipts:.2f} | ${expected:.2f} | ${predicted:.2f} | {error:+.2f} | {error_pct:+.1f}% |"
+    for (duration, miles, receipts, expected, case_letter), predicted, error, error_pct
+    in zip(test_cases, predicted_values, errors, error_pcts)
+))
 
 print(f"\nRefined Summary:")
 print(f"Accurate predictions (±25% error): {accurate_count_refined}/15 ({accurate_count_refined/15*100:.1f}%)")
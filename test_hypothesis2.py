@@ -1,48 +1,38 @@
 #!/usr/bin/env python3
 
-def calculate_reimbursement_hypothesis2(duration, miles, receipts):
+import numpy as np
+
+# Band edges: receipts bands are [lo, hi), miles-per-day bands are (lo, hi]
+RECEIPT_BAND_EDGES = np.array([300, 800, 1500])
+EFFICIENCY_BAND_EDGES = np.array([40, 80, 150, 250])
+
+# Per-band factors looked up by band index
+RECEIPT_MULTIPLIERS = np.array([0.8, 1.0, 1.1, 0.95])
+EFFICIENCY_FACTORS = np.array([1.2, 1.0, 0.8, 0.5, 0.3])
+
+def calculate_reimbursement_hypothesis2(duration, miles, receipts, miles_per_day=None):
     # Receipt base calculation
     receipt_base = receipts * 1.1
     
     # Receipt multiplier based on amount
-    if receipts < 300:
-        receipt_multiplier = 0.8
-    elif receipts < 800:
-        receipt_multiplier = 1.0
-    elif receipts < 1500:
-        receipt_multiplier = 1.1
-    else:
-        receipt_multiplier = 0.95
+    receipt_multiplier = RECEIPT_MULTIPLIERS[np.searchsorted(RECEIPT_BAND_EDGES, receipts, side='right')]
     
     # Efficiency penalty factor
-    miles_per_day = miles / duration
-    if miles_per_day <= 40:
-        efficiency_factor = 1.2
-    elif miles_per_day <= 80:
-        efficiency_factor = 1.0
-    elif miles_per_day <= 150:
-        efficiency_factor = 0.8
-    elif miles_per_day <= 250:
-        efficiency_factor = 0.5
-    else:
-        efficiency_factor = 0.3
+    if miles_per_day is None:
+        miles_per_day = miles / duration
+    efficiency_factor = EFFICIENCY_FACTORS[np.searchsorted(EFFICIENCY_BAND_EDGES, miles_per_day, side='left')]
     
     # Duration bonus
-    if duration == 1:
-        duration_bonus = 50
-    elif 2 <= duration <= 4:
-        duration_bonus = 100
-    elif duration == 5:
-        duration_bonus = 80
-    elif 6 <= duration <= 8:
-        duration_bonus = 60
-    else:
-        duration_bonus = 40
+    duration_bonus = np.select(
+        [duration == 1, (duration >= 2) & (duration <= 4), duration == 5, (duration >= 6) & (duration <= 8)],
+        [50, 100, 80, 60],
+        default=40
+    )
     
     return receipt_base * receipt_multiplier * efficiency_factor + duration_bonus
 
-# Test cases from our sample
-test_cases = [
+# Test cases from our sample, one record per case
+test_cases = np.rec.array([
     (1, 47, 17.97, 128.91, 'A'),
     (1, 55, 3.60, 126.06, 'B'),
     (2, 68, 756.61, 648.53, 'C'),
@@ -58,27 +48,28 @@ test_cases = [
     (2, 623, 347.54, 625.15, 'M'),
     (2, 941, 1565.77, 1432.79, 'N'),
     (9, 963, 588.50, 1434.42, 'O'),
-]
+], dtype=[('duration', 'i8'), ('miles', 'f8'), ('receipts', 'f8'), ('expected', 'f8'), ('letter', 'U1')])
+
+durations = test_cases.duration.astype(np.float64)
+miles_values, receipts_values, expected_values = test_cases.miles, test_cases.receipts, test_cases.expected
+miles_per_day_values = miles_values / durations
 
 print("Hypothesis 2: Efficiency-Penalty Focused Model Test Results:")
 print("| Case | Duration | Miles | Receipts | Expected | Predicted | Error | Error % | Efficiency |")
 print("|------|----------|-------|----------|----------|-----------|-------|---------|------------|")
 
-total_error = 0
-accurate_count = 0
+predicted_values = calculate_reimbursement_hypothesis2(durations, miles_values, receipts_values, miles_per_day_values)
+errors = predicted_values - expected_values
+error_pcts = (errors / expected_values) * 100
 
-for duration, miles, receipts, expected, case_letter in test_cases:
-    predicted = calculate_reimbursement_hypothesis2(duration, miles, receipts)
-    error = predicted - expected
-    error_pct = (error / expected) * 100
-    miles_per_day = miles / duration
-    
-    if abs(error_pct) <= 25:
-        accurate_count += 1
-    
-    total_error += abs(error_pct)
-    
-    print(f"| {case_letter} | {duration} | {miles:.0f} | ${receipts:.2f} | ${expected:.2f} | ${predicted:.2f} | {error:+.2f} | {error_pct:+.1f}% | {miles_per_day:.1f} mi/day |")
+accurate_count = int(np.count_nonzero(np.abs(error_pcts) <= 25))
+total_error = float(np.abs(error_pcts).sum())
+
+print("\n".join(
+    f"| {case_letter} | {duration} | {miles:.0f} | ${receipts:.2f} | ${expected:.2f} | ${predicted:.2f} | {error:+.2f} | {error_pct:+.1f}% | {miles_per_day:.1f} mi/day |"
+    for (duration, miles, receipts, expected, case_letter), predicted, error, error_pct, miles_per_day
+    in zip(test_cases, predicted_values, errors, error_pcts, miles_per_day_values)
+))
 
 print(f"\nSummary:")
 print(f"Accurate predictions (±25% error): {accurate_count}/15 ({accurate_count/15*100:.1f}%)")
@@ -88,68 +79,46 @@ print(f"Average absolute error: {total_error/15:.1f}%")
 print("\n" + "="*80)
 print("REFINED VERSION - Softer efficiency penalties, better low-receipt handling:")
 
-def calculate_reimbursement_hypothesis2_refined(duration, miles, receipts):
+# Refined per-band factors: less penalty for low receipts and high mileage
+RECEIPT_MULTIPLIERS_REFINED = np.array([0.9, 1.0, 1.1, 0.95])
+EFFICIENCY_FACTORS_REFINED = np.array([1.2, 1.0, 0.85, 0.6, 0.4])
+
+def calculate_reimbursement_hypothesis2_refined(duration, miles, receipts, miles_per_day=None):
     # Receipt base calculation with minimum for low receipts
-    if receipts < 50:
-        receipt_base = max(receipts * 1.1, 80)
-    else:
-        receipt_base = receipts * 1.1
+    receipt_base = np.where(receipts < 50, np.maximum(receipts * 1.1, 80), receipts * 1.1)
     
     # Receipt multiplier based on amount
-    if receipts < 300:
-        receipt_multiplier = 0.9  # Less penalty for low receipts
-    elif receipts < 800:
-        receipt_multiplier = 1.0
-    elif receipts < 1500:
-        receipt_multiplier = 1.1
-    else:
-        receipt_multiplier = 0.95
+    receipt_multiplier = RECEIPT_MULTIPLIERS_REFINED[np.searchsorted(RECEIPT_BAND_EDGES, receipts, side='right')]
     
     # Efficiency penalty factor (softer penalties)
-    miles_per_day = miles / duration
-    if miles_per_day <= 40:
-        efficiency_factor = 1.2
-    elif miles_per_day <= 80:
-        efficiency_factor = 1.0
-    elif miles_per_day <= 150:
-        efficiency_factor = 0.85  # Less penalty
-    elif miles_per_day <= 250:
-        efficiency_factor = 0.6   # Less penalty
-    else:
-        efficiency_factor = 0.4   # Less severe penalty
+    if miles_per_day is None:
+        miles_per_day = miles / duration
+    efficiency_factor = EFFICIENCY_FACTORS_REFINED[np.searchsorted(EFFICIENCY_BAND_EDGES, miles_per_day, side='left')]
     
     # Duration bonus (higher for short trips)
-    if duration == 1:
-        duration_bonus = 100  # Higher bonus
-    elif 2 <= duration <= 4:
-        duration_bonus = 100
-    elif duration == 5:
-        duration_bonus = 80
-    elif 6 <= duration <= 8:
-        duration_bonus = 60
-    else:
-        duration_bonus = 40
+    duration_bonus = np.select(
+        [duration == 1, (duration >= 2) & (duration <= 4), duration == 5, (duration >= 6) & (duration <= 8)],
+        [100, 100, 80, 60],  # Higher bonus for 1-day trips
+        default=40
+    )
     
     return receipt_base * receipt_multiplier * efficiency_factor + duration_bonus
 
 print("| Case | Duration | Miles | Receipts | Expected | Predicted | Error | Error % | Efficiency |")
 print("|------|----------|-------|----------|----------|-----------|-------|---------|------------|")
 
-total_error_refined = 0
-accurate_count_refined = 0
+predicted_values = calculate_reimbursement_hypothesis2_refined(durations, miles_values, receipts_values, miles_per_day_values)
+errors = predicted_values - expected_values
+error_pcts = (errors / expected_values) * 100
 
-for duration, miles, receipts, expected, case_letter in test_cases:
-    predicted = calculate_reimbursement_hypothesis2_refined(duration, miles, receipts)
-    error = predicted - expected
-    error_pct = (error / expected) * 100
-    miles_per_day = miles / duration
-    
-    if abs(error_pct) <= 25:
-        accurate_count_refined += 1
-    
-    total_error_refined += abs(error_pct)
-    
-    print(f"| {case_letter} | {duration} | {miles:.0f} | ${receipts:.2f} | ${expected:.2f} | ${predicted:.2f} | {error:+.2f} | {error_pct:+.1f}% | {miles_per_day:.1f} mi/day |")
+accurate_count_refined = int(np.count_nonzero(np.abs(error_pcts) <= 25))
+total_error_refined = float(np.abs(error_pcts).sum())
+
+print("\n".join(
+    f"| {case_letter} | {duration} | {miles:.0f} | ${receipts:.2f} | ${expected:.2f} | ${predicted:.2f} | {error:+.2f} | {error_pct:+.1f}% | {miles_per_day:.1f} mi/day |"
+    for (duration, miles, receipts, expected, case_letter), predicted, error, error_pct, miles_per_day
+    in zip(test_cases, predicted_values, errors, error_pcts, miles_per_day_values)
+))
 
 print(f"\nRefined Summary:")
 print(f"Accurate predictions (±25% error): {accurate_count_refined}/15 ({accurate_count_refined/15*100:.1f}%)")
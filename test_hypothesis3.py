@@ -1,36 +1,42 @@
 #!/usr/bin/env python3
 
-def calculate_reimbursement_hypothesis3(duration, miles, receipts):
-    miles_per_day = miles / duration
+from collections import Counter
+
+import numpy as np
+
+def calculate_reimbursement_hypothesis3(duration, miles, receipts, miles_per_day=None):
+    if miles_per_day is None:
+        miles_per_day = miles / duration
     
     # Edge Case 1: Very low receipts
-    if receipts < 50:
-        base_reimbursement = 120
-        receipt_bonus = receipts * 0.3
-        return base_reimbursement + receipt_bonus
+    base_reimbursement = 120
+    receipt_bonus = receipts * 0.3
+    low_receipts = base_reimbursement + receipt_bonus
     
     # Edge Case 2: Long-distance business trips
-    if duration >= 5 and miles >= 800:
-        base = 200 + (duration * 50)
-        mileage_component = miles * 0.8
-        receipt_component = receipts * 0.6
-        return base + mileage_component + receipt_component
+    base = 200 + (duration * 50)
+    mileage_component = miles * 0.8
+    receipt_component = receipts * 0.6
+    long_distance = base + mileage_component + receipt_component
     
     # Edge Case 3: Travel day scenarios
-    if miles_per_day > 300:
-        if receipts > 1000:
-            return receipts * 0.9
-        else:
-            return max(receipts * 1.5, 400)
+    travel_day = np.where(receipts > 1000, receipts * 0.9, np.maximum(receipts * 1.5, 400))
     
     # Default: Use refined Hypothesis 1 for normal cases
-    base_rate = max(100 - (duration - 1) * 10, 50)
+    base_rate = np.maximum(100 - (duration - 1) * 10, 50)
     receipt_component = receipts * 1.0
-    efficiency_penalty = -max(0, (miles_per_day - 30) * 2.0)
-    return base_rate + receipt_component + efficiency_penalty
-
-# Test cases from our sample
-test_cases = [
+    efficiency_penalty = -np.maximum(0, (miles_per_day - 30) * 2.0)
+    normal = base_rate + receipt_component + efficiency_penalty
+    
+    # The first matching edge case wins
+    return np.select(
+        [receipts < 50, (duration >= 5) & (miles >= 800), miles_per_day > 300],
+        [low_receipts, long_distance, travel_day],
+        default=normal
+    )
+
+# Test cases from our sample, one record per case
+test_cases = np.rec.array([
     (1, 47, 17.97, 128.91, 'A'),
     (1, 55, 3.60, 126.06, 'B'),
     (2, 68, 756.61, 648.53, 'C'),
@@ -46,38 +52,41 @@ test_cases = [
     (2, 623, 347.54, 625.15, 'M'),
     (2, 941, 1565.77, 1432.79, 'N'),
     (9, 963, 588.50, 1434.42, 'O'),
-]
-
-def get_edge_case_type(duration, miles, receipts):
-    miles_per_day = miles / duration
-    if receipts < 50:
-        return "Low receipts"
-    elif duration >= 5 and miles >= 800:
-        return "Long distance"
-    elif miles_per_day > 300:
-        return "Travel day"
-    else:
-        return "Normal"
+], dtype=[('duration', 'i8'), ('miles', 'f8'), ('receipts', 'f8'), ('expected', 'f8'), ('letter', 'U1')])
+
+durations = test_cases.duration.astype(np.float64)
+miles_values, receipts_values, expected_values = test_cases.miles, test_cases.receipts, test_cases.expected
+miles_per_day_values = miles_values / durations
+
+EDGE_CASE_LABELS = np.array(["Low receipts", "Long distance", "Travel day", "Normal"])
+
+def get_edge_case_type(duration, miles, receipts, miles_per_day=None):
+    if miles_per_day is None:
+        miles_per_day = miles / duration
+    # Same conditions and order as calculate_reimbursement_hypothesis3
+    return EDGE_CASE_LABELS[np.select(
+        [receipts < 50, (duration >= 5) & (miles >= 800), miles_per_day > 300],
+        [0, 1, 2],
+        default=3
+    )]
 
 print("Hypothesis 3: Edge Case and Special Conditions Model Test Results:")
 print("| Case | Duration | Miles | Receipts | Expected | Predicted | Error | Error % | Edge Case |")
 print("|------|----------|-------|----------|----------|-----------|-------|---------|-----------|")
 
-total_error = 0
-accurate_count = 0
+predicted_values = calculate_reimbursement_hypothesis3(durations, miles_values, receipts_values, miles_per_day_values)
+edge_cases = get_edge_case_type(durations, miles_values, receipts_values, miles_per_day_values).tolist()
+errors = predicted_values - expected_values
+error_pcts = (errors / expected_values) * 100
 
-for duration, miles, receipts, expected, case_letter in test_cases:
-    predicted = calculate_reimbursement_hypothesis3(duration, miles, receipts)
-    error = predicted - expected
-    error_pct = (error / expected) * 100
-    edge_case = get_edge_case_type(duration, miles, receipts)
-    
-    if abs(error_pct) <= 25:
-        accurate_count += 1
-    
-    total_error += abs(error_pct)
-    
-    print(f"| {case_letter} | {duration} | {miles:.0f} | ${receipts:.2f} | ${expected:.2f} | ${predicted:.2f} | {error:+.2f} | {error_pct:+.1f}% | {edge_case} |")
+accurate_count = int(np.count_nonzero(np.abs(error_pcts) <= 25))
+total_error = float(np.abs(error_pcts).sum())
+
+print("\n".join(
+    f"| {case_letter} | {duration} | {miles:.0f} | ${receipts:.2f} | ${expected:.2f} | ${predicted:.2f} | {error:+.2f} | {error_pct:+.1f}% | {edge_case} |"
+    for (duration, miles, receipts, expected, case_letter), predicted, error, error_pct, edge_case
+    in zip(test_cases, predicted_values, errors, error_pcts, edge_cases)
+))
 
 print(f"\nSummary:")
 print(f"Accurate predictions (±25% error): {accurate_count}/15 ({accurate_count/15*100:.1f}%)")
@@ -87,79 +96,85 @@ print(f"Average absolute error: {total_error/15:.1f}%")
 print("\n" + "="*80)
 print("REFINED VERSION - Additional edge cases for remaining issues:")
 
-def calculate_reimbursement_hypothesis3_refined(duration, miles, receipts):
-    miles_per_day = miles / duration
+def calculate_reimbursement_hypothesis3_refined(duration, miles, receipts, miles_per_day=None):
+    if miles_per_day is None:
+        miles_per_day = miles / duration
     
     # Edge Case 1: Very low receipts
-    if receipts < 50:
-        base_reimbursement = 120
-        receipt_bonus = receipts * 0.3
-        return base_reimbursement + receipt_bonus
+    base_reimbursement = 120
+    receipt_bonus = receipts * 0.3
+    low_receipts = base_reimbursement + receipt_bonus
     
     # Edge Case 2: Long-distance business trips
-    if duration >= 5 and miles >= 800:
-        base = 200 + (duration * 50)
-        mileage_component = miles * 0.8
-        receipt_component = receipts * 0.6
-        return base + mileage_component + receipt_component
+    base = 200 + (duration * 50)
+    mileage_component = miles * 0.8
+    receipt_component = receipts * 0.6
+    long_distance = base + mileage_component + receipt_component
     
     # Edge Case 3: Travel day scenarios
-    if miles_per_day > 300:
-        if receipts > 1000:
-            return receipts * 0.9
-        else:
-            return max(receipts * 1.5, 400)
+    travel_day = np.where(receipts > 1000, receipts * 0.9, np.maximum(receipts * 1.5, 400))
     
     # Edge Case 4: Extended business trips (for case O)
-    if duration >= 8 and 50 <= miles_per_day <= 150:
-        return receipts * 1.8 + (duration * 100)
+    extended_business = receipts * 1.8 + (duration * 100)
     
     # Edge Case 5: 5-day trips with special handling (for case H)
-    if duration == 5:
-        if miles_per_day < 50:
-            return receipts * 0.7  # Low efficiency penalty
-        else:
-            return receipts * 1.2 + (miles * 0.5)  # High efficiency bonus
+    five_day = np.where(
+        miles_per_day < 50,
+        receipts * 0.7,  # Low efficiency penalty
+        receipts * 1.2 + (miles * 0.5)  # High efficiency bonus
+    )
     
     # Default: Use refined Hypothesis 1 for normal cases
-    base_rate = max(100 - (duration - 1) * 10, 50)
+    base_rate = np.maximum(100 - (duration - 1) * 10, 50)
     receipt_component = receipts * 1.0
-    efficiency_penalty = -max(0, (miles_per_day - 30) * 2.0)
-    return base_rate + receipt_component + efficiency_penalty
-
-def get_edge_case_type_refined(duration, miles, receipts):
-    miles_per_day = miles / duration
-    if receipts < 50:
-        return "Low receipts"
-    elif duration >= 5 and miles >= 800:
-        return "Long distance"
-    elif miles_per_day > 300:
-        return "Travel day"
-    elif duration >= 8 and 50 <= miles_per_day <= 150:
-        return "Extended business"
-    elif duration == 5:
-        return "5-day special"
-    else:
-        return "Normal"
+    efficiency_penalty = -np.maximum(0, (miles_per_day - 30) * 2.0)
+    normal = base_rate + receipt_component + efficiency_penalty
+    
+    # The first matching edge case wins
+    return np.select(
+        [receipts < 50,
+         (duration >= 5) & (miles >= 800),
+         miles_per_day > 300,
+         (duration >= 8) & (miles_per_day >= 50) & (miles_per_day <= 150),
+         duration == 5],
+        [low_receipts, long_distance, travel_day, extended_business, five_day],
+        default=normal
+    )
+
+EDGE_CASE_LABELS_REFINED = np.array(
+    ["Low receipts", "Long distance", "Travel day", "Extended business", "5-day special", "Normal"]
+)
+
+def get_edge_case_type_refined(duration, miles, receipts, miles_per_day=None):
+    if miles_per_day is None:
+        miles_per_day = miles / duration
+    # Same conditions and order as calculate_reimbursement_hypothesis3_refined
+    return EDGE_CASE_LABELS_REFINED[np.select(
+        [receipts < 50,
+         (duration >= 5) & (miles >= 800),
+         miles_per_day > 300,
+         (duration >= 8) & (miles_per_day >= 50) & (miles_per_day <= 150),
+         duration == 5],
+        [0, 1, 2, 3, 4],
+        default=5
+    )]
 
 print("| Case | Duration | Miles | Receipts | Expected | Predicted | Error | Error % | Edge Case |")
 print("|------|----------|-------|----------|----------|-----------|-------|---------|-----------|")
 
-total_error_refined = 0
-accurate_count_refined = 0
+predicted_values = calculate_reimbursement_hypothesis3_refined(durations, miles_values, receipts_values, miles_per_day_values)
+edge_cases = get_edge_case_type_refined(durations, miles_values, receipts_values, miles_per_day_values).tolist()
+errors = predicted_values - expected_values
+error_pcts = (errors / expected_values) * 100
 
-for duration, miles, receipts, expected, case_letter in test_cases:
-    predicted = calculate_reimbursement_hypothesis3_refined(duration, miles, receipts)
-    error = predicted - expected
-    error_pct = (error / expected) * 100
-    edge_case = get_edge_case_type_refined(duration, miles, receipts)
-    
-    if abs(error_pct) <= 25:
-        accurate_count_refined += 1
-    
-    total_error_refined += abs(error_pct)
-    
-    print(f"| {case_letter} | {duration} | {miles:.0f} | ${receipts:.2f} | ${expected:.2f} | ${predicted:.2f} | {error:+.2f} | {error_pct:+.1f}% | {edge_case} |")
+accurate_count_refined = int(np.count_nonzero(np.abs(error_pcts) <= 25))
+total_error_refined = float(np.abs(error_pcts).sum())
+
+print("\n".join(
+    f"| {case_letter} | {duration} | {miles:.0f} | ${receipts:.2f} | ${expected:.2f} | ${predicted:.2f} | {error:+.2f} | {error_pct:+.1f}% | {edge_case} |"
+    for (duration, miles, receipts, expected, case_letter), predicted, error, error_pct, edge_case
+    in zip(test_cases, predicted_values, errors, error_pcts, edge_cases)
+))
 
 print(f"\nRefined Summary:")
 print(f"Accurate predictions (±25% error): {accurate_count_refined}/15 ({accurate_count_refined/15*100:.1f}%)")
@@ -175,10 +190,7 @@ print(f"Hypothesis 3 (refined): {accurate_count_refined/15*100:.1f}% accuracy, {
 
 # Analyze edge case distribution
 print(f"\nEdge Case Distribution:")
-edge_case_counts = {}
-for duration, miles, receipts, expected, case_letter in test_cases:
-    edge_case = get_edge_case_type_refined(duration, miles, receipts)
-    edge_case_counts[edge_case] = edge_case_counts.get(edge_case, 0) + 1
+edge_case_counts = Counter(edge_cases)
 
 for edge_case, count in edge_case_counts.items():
     print(f"{edge_case}: {count} cases ({count/15*100:.1f}%)") 
\ No newline at end of file
@@ -3,6 +3,8 @@
 Test script for pattern analysis on real data
 """
 
+import heapq
+from collections import Counter
 from calculate_reimbursement import *
 
 def analyze_real_error_patterns():
@@ -14,19 +16,8 @@ def analyze_real_error_patterns():
     print("Analyzing first 100 cases...")
     sample_cases = test_cases[:100]
     
-    # Calculate our predictions and get error metrics
-    calculated = []
-    expected = []
-    
-    for case in sample_cases:
-        inputs = case['input']
-        calc_value = calculate_reimbursement(
-            inputs['trip_duration_days'],
-            inputs['miles_traveled'],
-            inputs['total_receipts_amount']
-        )
-        calculated.append(calc_value)
-        expected.append(case['expected_output'])
+    # Calculate our predictions in one batch and get error metrics
+    calculated, expected = predict_test_cases(sample_cases)
     
     # Get error metrics
     error_metrics = calculate_error_metrics(calculated, expected)
@@ -75,35 +66,22 @@ def analyze_real_error_patterns():
     # Input Correlations
     print(f"\n🔍 INPUT CORRELATIONS:")
     
-    # Trip Duration Correlations
-    print(f"\n  By Trip Duration:")
-    duration_corr = patterns['input_correlation_patterns']['by_trip_duration']
-    for duration_cat, stats in duration_corr.items():
-        if isinstance(stats, dict) and 'count' in stats:
-            print(f"    {duration_cat.replace('_', ' ').title()}: {stats['count']} cases")
-            print(f"      Mean Abs Error: ${stats['mean_absolute_error']:.2f}")
-            print(f"      Mean % Error: {stats['mean_percentage_error']:.1f}%")
-            print(f"      Overestimate Rate: {stats['overestimate_rate']:.1f}%")
-    
-    # Efficiency Correlations
-    print(f"\n  By Efficiency Category:")
-    efficiency_corr = patterns['input_correlation_patterns']['by_efficiency_category']
-    for efficiency_cat, stats in efficiency_corr.items():
-        if isinstance(stats, dict) and 'count' in stats:
-            print(f"    {efficiency_cat.replace('_', ' ').title()}: {stats['count']} cases")
-            print(f"      Mean Abs Error: ${stats['mean_absolute_error']:.2f}")
-            print(f"      Mean % Error: {stats['mean_percentage_error']:.1f}%")
-            print(f"      Overestimate Rate: {stats['overestimate_rate']:.1f}%")
-    
-    # Receipt Range Correlations
-    print(f"\n  By Receipt Range:")
-    receipt_corr = patterns['input_correlation_patterns']['by_receipt_range']
-    for receipt_cat, stats in receipt_corr.items():
-        if isinstance(stats, dict) and 'count' in stats:
-            print(f"    {receipt_cat.replace('_', ' ').title()}: {stats['count']} cases")
-            print(f"      Mean Abs Error: ${stats['mean_absolute_error']:.2f}")
-            print(f"      Mean % Error: {stats['mean_percentage_error']:.1f}%")
-            print(f"      Overestimate Rate: {stats['overestimate_rate']:.1f}%")
+    # Trip Duration, Efficiency and Receipt Range Correlations
+    correlation_patterns = patterns['input_correlation_patterns']
+    duration_corr = correlation_patterns['by_trip_duration']
+    efficiency_corr = correlation_patterns['by_efficiency_category']
+    for heading, category_corr in [
+        ('By Trip Duration', duration_corr),
+        ('By Efficiency Category', efficiency_corr),
+        ('By Receipt Range', correlation_patterns['by_receipt_range'])
+    ]:
+        print(f"\n  {heading}:")
+        for category, stats in category_corr.items():
+            if isinstance(stats, dict) and 'count' in stats:
+                print(f"    {category.replace('_', ' ').title()}: {stats['count']} cases")
+                print(f"      Mean Abs Error: ${stats['mean_absolute_error']:.2f}")
+                print(f"      Mean % Error: {stats['mean_percentage_error']:.1f}%")
+                print(f"      Overestimate Rate: {stats['overestimate_rate']:.1f}%")
     
     # Find worst performing combinations
     print(f"\n🎯 WORST PERFORMING COMBINATIONS:")
@@ -114,10 +92,10 @@ def analyze_real_error_patterns():
         if isinstance(stats, dict) and 'count' in stats and stats['count'] >= 2:
             worst_combinations.append((combo_key, stats['mean_percentage_error'], stats['count']))
     
-    # Sort by worst mean percentage error
-    worst_combinations.sort(key=lambda x: x[1], reverse=True)
+    # Top 5 by worst mean percentage error
+    worst_combinations = heapq.nlargest(5, worst_combinations, key=lambda x: x[1])
     
-    for i, (combo, error, count) in enumerate(worst_combinations[:5]):
+    for i, (combo, error, count) in enumerate(worst_combinations):
         duration_cat, efficiency_cat = combo.split('_', 1)
         print(f"  {i+1}. {duration_cat.replace('_', ' ').title()} + {efficiency_cat.replace('_', ' ').title()}")
         print(f"     {count} cases, {error:.1f}% avg error")
@@ -131,8 +109,8 @@ def analyze_real_error_patterns():
         negative_cases = patterns['critical_issues']['negative_values']
         efficiency_categories = [case['derived_metrics']['efficiency_category'] for case in negative_cases]
         duration_categories = [case['derived_metrics']['trip_duration_category'] for case in negative_cases]
-        print(f"     Most common in: {max(set(efficiency_categories), key=efficiency_categories.count)} efficiency")
-        print(f"     Most common duration: {max(set(duration_categories), key=duration_categories.count)}")
+        print(f"     Most common in: {Counter(efficiency_categories).most_common(1)[0][0]} efficiency")
+        print(f"     Most common duration: {Counter(duration_categories).most_common(1)[0][0]}")
     
     # Check for efficiency-based patterns
     efficiency_errors = [(cat, stats['mean_percentage_error']) for cat, stats in efficiency_corr.items() 
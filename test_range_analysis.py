@@ -3,6 +3,9 @@
 Test script for detailed range analysis on real data
 """
 
+import heapq
+
+import numpy as np
 from calculate_reimbursement import *
 
 def analyze_error_prone_ranges():
@@ -14,19 +17,22 @@ def analyze_error_prone_ranges():
     print("Analyzing first 100 cases...")
     sample_cases = test_cases[:100]
     
-    # Calculate our predictions and get error metrics
-    calculated = []
-    expected = []
-    
-    for case in sample_cases:
-        inputs = case['input']
-        calc_value = calculate_reimbursement(
-            inputs['trip_duration_days'],
-            inputs['miles_traveled'],
-            inputs['total_receipts_amount']
-        )
-        calculated.append(calc_value)
-        expected.append(case['expected_output'])
+    # One array per input field and derived rate (0 wherever duration is not positive)
+    inputs = [case['input'] for case in sample_cases]
+    durations = np.array([case_inputs['trip_duration_days'] for case_inputs in inputs], dtype=np.float64)
+    miles_values = np.array([case_inputs['miles_traveled'] for case_inputs in inputs], dtype=np.float64)
+    receipts_values = np.array([case_inputs['total_receipts_amount'] for case_inputs in inputs], dtype=np.float64)
+    durations_safe = np.where(durations > 0, durations, 1)
+    param_values = {
+        'trip_duration_days': durations,
+        'miles_traveled': miles_values,
+        'total_receipts_amount': receipts_values,
+        'miles_per_day': np.where(durations > 0, miles_values / durations_safe, 0),
+        'receipts_per_day': np.where(durations > 0, receipts_values / durations_safe, 0)
+    }
+    
+    # Calculate our predictions in one batch and get error metrics
+    calculated, expected = predict_test_cases(sample_cases)
     
     # Get error metrics
     error_metrics = calculate_error_metrics(calculated, expected)
@@ -47,14 +53,10 @@ def analyze_error_prone_ranges():
     for param_name, ranges in range_analysis['parameter_ranges'].items():
         print(f"\n  {param_name.replace('_', ' ').title()}:")
         
-        # Sort ranges by error rate
-        sorted_ranges = sorted(
-            [(range_key, stats) for range_key, stats in ranges.items()],
-            key=lambda x: x[1]['mean_percentage_error'],
-            reverse=True
-        )
+        # Top 5 worst ranges by error rate
+        worst_ranges = heapq.nlargest(5, ranges.items(), key=lambda x: x[1]['mean_percentage_error'])
         
-        for range_key, stats in sorted_ranges[:5]:  # Show top 5 worst ranges
+        for range_key, stats in worst_ranges:
             if stats['count'] >= 2:  # Only show ranges with multiple cases
                 print(f"    Range {range_key}: {stats['count']} cases")
                 print(f"      Mean % Error: {stats['mean_percentage_error']:.1f}%")
@@ -129,7 +131,17 @@ def analyze_error_prone_ranges():
     print(f"\n🔍 DETAILED ANALYSIS OF MOST CRITICAL CASES:")
     
     # Find the most problematic individual cases
-    worst_cases = sorted(error_data, key=lambda x: abs(x['percentage_error']), reverse=True)[:5]
+    worst_cases = heapq.nlargest(5, error_data, key=lambda x: abs(x['percentage_error']))
+    
+    # Critical range membership for every case at once: one (cases x ranges) mask per parameter
+    range_memberships = []
+    for param_name, critical_ranges in range_analysis['critical_ranges'].items():
+        if param_name in param_values and critical_ranges:
+            bounds = np.array([range_info['stats']['range'] for range_info in critical_ranges], dtype=np.float64)
+            values = param_values[param_name][:, None]
+            in_range = (values >= bounds[:, 0]) & (values <= bounds[:, 1])
+            labels = [f"{param_name}:{range_info['range_key']}" for range_info in critical_ranges]
+            range_memberships.append((labels, in_range))
     
     for i, case in enumerate(worst_cases, 1):
         idx = case['test_case_index']
@@ -138,8 +150,8 @@ def analyze_error_prone_ranges():
         duration = inputs['trip_duration_days']
         miles = inputs['miles_traveled']
         receipts = inputs['total_receipts_amount']
-        miles_per_day = miles / duration if duration > 0 else 0
-        receipts_per_day = receipts / duration if duration > 0 else 0
+        miles_per_day = param_values['miles_per_day'][idx]
+        receipts_per_day = param_values['receipts_per_day'][idx]
         
         print(f"\n  Case {i} (Index {idx}):")
         print(f"    Inputs: {duration} days, {miles} miles, ${receipts:.2f} receipts")
@@ -149,22 +161,12 @@ def analyze_error_prone_ranges():
         print(f"    Error: {case['percentage_error']:+.1f}% (${case['absolute_error']:+.2f})")
         
         # Identify which critical ranges this case falls into
-        critical_memberships = []
-        for param_name, critical_ranges in range_analysis['critical_ranges'].items():
-            param_values = {
-                'trip_duration_days': duration,
-                'miles_traveled': miles,
-                'total_receipts_amount': receipts,
-                'miles_per_day': miles_per_day,
-                'receipts_per_day': receipts_per_day
-            }
-            
-            if param_name in param_values:
-                value = param_values[param_name]
-                for range_info in critical_ranges:
-                    range_start, range_end = range_info['stats']['range']
-                    if range_start <= value <= range_end:
-                        critical_memberships.append(f"{param_name}:{range_info['range_key']}")
+        critical_memberships = [
+            label
+            for labels, in_range in range_memberships
+            for label, is_member in zip(labels, in_range[idx])
+            if is_member
+        ]
         
         if critical_memberships:
             print(f"    Critical Ranges: {', '.join(critical_memberships)}")